@@ -1,22 +1,29 @@
 '''This module houses the metric objects for the sim app'''
+import array
+import atexit
 import math
 import time
 import json
 import logging
 import os
-from collections import OrderedDict
-import statistics
+from concurrent.futures import ThreadPoolExecutor, wait
 import boto3
 import botocore
 import rospy
+try:
+    import orjson
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+    _ORJSON_OPTIONS = 0
 from deepracer_simulation_environment.srv import VideoMetricsSrvResponse, VideoMetricsSrv
-from markov.constants import BEST_CHECKPOINT, LAST_CHECKPOINT
+from markov.constants import BEST_CHECKPOINT, LAST_CHECKPOINT, NUM_RETRIES
 from markov.common import ObserverInterface
 from markov.metrics.constants import (MetricsS3Keys, StepMetrics, EpisodeStatus,
                                       IterationDataLocalFileNames, ITERATION_DATA_LOCAL_FILE_PATH,
                                       Mp4VideoMetrics)
 from markov.metrics.metrics_interface import MetricsInterface
-from markov.utils import get_boto_config, get_s3_kms_extra_args
+from markov.utils import get_s3_kms_extra_args
 from markov.log_handler.logger import Logger
 from markov.log_handler.exception_handler import log_and_exit
 from markov.log_handler.constants import (SIMAPP_SIMULATION_WORKER_EXCEPTION,
@@ -28,6 +35,46 @@ from rl_coach.core_types import RunPhase
 
 LOGGER = Logger(__name__, logging.INFO).get_logger()
 
+# Cache of s3 clients keyed by region so each upload reuses the same
+# connection pool instead of paying for a new session and TLS handshake
+_S3_CLIENTS = dict()
+
+# Metrics uploads can run concurrently on the upload pool, so size the
+# connection pool above botocore's default of ten to keep every PUT on an
+# already established HTTPS connection
+_METRICS_BOTO_CONFIG = botocore.config.Config(max_pool_connections=32,
+                                              retries=dict(max_attempts=NUM_RETRIES,
+                                                           mode='standard'))
+
+def _get_s3_client(region):
+    '''Returns a lazily created s3 client for the given region
+       region - String with aws region
+    '''
+    if region not in _S3_CLIENTS:
+        session = boto3.session.Session()
+        _S3_CLIENTS[region] = session.client('s3', region_name=region,
+                                             config=_METRICS_BOTO_CONFIG)
+    return _S3_CLIENTS[region]
+
+# Pool for uploading metrics in the background so the training and eval loops
+# don't block on s3 latency. A single worker keeps PUTs to the same key
+# ordered, an older snapshot of the growing metrics object must never land
+# after a newer one
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=1)
+atexit.register(_UPLOAD_POOL.shutdown)
+
+# Uploads that have been submitted but not yet completed, drained on the
+# worker shutdown paths which exit through os._exit and bypass atexit
+_PENDING_UPLOADS = set()
+
+def drain_metrics_uploads():
+    '''Blocks until every queued metrics upload has completed, must be called
+       on shutdown paths so the final episode's metrics land before the
+       process goes away
+    '''
+    _flush_pending_manifests()
+    wait(list(_PENDING_UPLOADS))
+
 #! TODO this needs to be removed after muti part is fixed, note we don't have
 # agent name here, but we can add it to the step metrics if needed
 def sim_trace_log(sim_trace_dict):
@@ -35,8 +82,85 @@ def sim_trace_log(sim_trace_dict):
        sim_trace_dict - Ordered dict containing the step metrics, note order must match
                         precision in the string
     '''
-    LOGGER.info('SIM_TRACE_LOG:%d,%d,%.4f,%.4f,%.4f,%.2f,%.2f,%d,%.4f,%s,%s,%.4f,%d,%.2f,%s,%s\n' % \
-        (tuple(sim_trace_dict.values())))
+    _emit_step_metrics(sim_trace_dict)
+
+def _emit_step_metrics(metrics_data, file_path=None):
+    '''Formats the step metrics once and dispatches the row to both sinks,
+       the SIM_TRACE_LOG cloud watch line and, when a path is given, the
+       local simtrace file
+       metrics_data - Ordered dict containing the step metrics, note order must
+                      match precision in the row template
+       file_path - Path of the local simtrace file, None skips the file sink
+    '''
+    log_enabled = LOGGER.isEnabledFor(logging.INFO)
+    if not log_enabled and file_path is None:
+        return
+    # f-string over the hoisted keys, avoids materializing an intermediate
+    # tuple of the dict values; precision per column matches the row template.
+    # The integer columns are coerced with int() since the sim hands some of
+    # them over as floats (steps is a float counter) and %d used to truncate
+    row = (f'{int(metrics_data[_SM_EPISODE]):d},{int(metrics_data[_SM_STEPS]):d},'
+           f'{metrics_data[_SM_X]:.4f},{metrics_data[_SM_Y]:.4f},'
+           f'{metrics_data[_SM_YAW]:.4f},{metrics_data[_SM_STEER]:.2f},'
+           f'{metrics_data[_SM_THROTTLE]:.2f},{int(metrics_data[_SM_ACTION]):d},'
+           f'{metrics_data[_SM_REWARD]:.4f},{metrics_data[_SM_DONE]},'
+           f'{metrics_data[_SM_WHEELS_TRACK]},{metrics_data[_SM_PROG]:.4f},'
+           f'{int(metrics_data[_SM_CLS_WAYPNT]):d},{metrics_data[_SM_TRACK_LEN]:.2f},'
+           f'{metrics_data[_SM_TIME]},{metrics_data[_SM_EPISODE_STATUS]}\n')
+    if log_enabled:
+        LOGGER.info('SIM_TRACE_LOG:%s', row)
+    if file_path is not None:
+        _get_simtrace_handle(file_path).write(row)
+
+# In incremental upload mode the shard manifest is refreshed every this
+# many episodes
+MANIFEST_UPLOAD_FREQUENCY = 10
+
+# Shard counts not yet recorded in an uploaded manifest, keyed by
+# (bucket, region, manifest key) and flushed when the uploads are drained so
+# the manifest isn't left stale at run end
+_PENDING_MANIFESTS = dict()
+
+def _flush_pending_manifests():
+    '''Uploads the latest shard count for every manifest that is behind the
+       shards already written
+    '''
+    while _PENDING_MANIFESTS:
+        (bucket, region, manifest_key), episodes = _PENDING_MANIFESTS.popitem()
+        write_metrics_to_s3(bucket, manifest_key, region, {'episodes': episodes})
+
+def write_incremental_metrics_to_s3(bucket, key, region, episode_num, episode_metric):
+    '''Helper method that uploads a single episode's metrics to a sharded key
+       derived from the metrics key, keeping the per-upload payload bounded
+       instead of rewriting the full history, and refreshes a small manifest
+       every MANIFEST_UPLOAD_FREQUENCY episodes so consumers can aggregate the
+       shards via list_objects_v2
+       bucket - String with S3 bucket where metrics should be written
+       key - String with S3 bucket key the sharded keys are derived from
+       region - String with aws region
+       episode_num - Int with the one based episode number of the shard
+       episode_metric - Dictionary with the single episode's metrics
+    '''
+    base_key = os.path.splitext(key)[0]
+    write_metrics_body_to_s3(bucket, '{}/ep-{:08d}.json'.format(base_key, episode_num),
+                             region, serialize_metrics(episode_metric))
+    manifest_key = '{}/manifest.json'.format(base_key)
+    if episode_num % MANIFEST_UPLOAD_FREQUENCY == 0:
+        _PENDING_MANIFESTS.pop((bucket, region, manifest_key), None)
+        write_metrics_to_s3(bucket, manifest_key, region, {'episodes': episode_num})
+    else:
+        _PENDING_MANIFESTS[(bucket, region, manifest_key)] = episode_num
+
+def serialize_metrics(metrics):
+    '''Helper method that serializes the given metrics to utf-8 encoded json bytes
+       metrics - Dictionary or list with metrics to serialize
+    '''
+    # orjson serializes straight to bytes and is an order of magnitude faster
+    # than the stdlib encoder for these plain dict/list payloads; the numpy
+    # option keeps numpy scalars from the sim on orjson's native fast path
+    if orjson is not None:
+        return orjson.dumps(metrics, option=_ORJSON_OPTIONS)
+    return bytes(json.dumps(metrics), encoding='utf-8')
 
 def write_metrics_to_s3(bucket, key, region, metrics):
     '''Helper method that uploads the desired metrics to s3
@@ -45,12 +169,34 @@ def write_metrics_to_s3(bucket, key, region, metrics):
        region - String with aws region
        metrics - Dictionary with metrics to write to s3
     '''
+    write_metrics_body_to_s3(bucket, key, region, serialize_metrics(metrics))
+
+def write_metrics_body_to_s3(bucket, key, region, body):
+    '''Helper method that uploads an already serialized metrics payload to s3
+       on a background thread, callers serialize the payload up front so the
+       snapshot handed to the worker is consistent
+       bucket - String with S3 bucket where metrics should be written
+       key - String with S3 bucket key where metrics should be written
+       region - String with aws region
+       body - Bytes with the serialized json payload to upload
+    '''
+    future = _UPLOAD_POOL.submit(_put_metrics_body, bucket, key, region, body)
+    _PENDING_UPLOADS.add(future)
+    future.add_done_callback(_PENDING_UPLOADS.discard)
+    return future
+
+def _put_metrics_body(bucket, key, region, body):
+    '''Uploads the given payload to s3, runs on the upload pool's worker threads
+       bucket - String with S3 bucket where metrics should be written
+       key - String with S3 bucket key where metrics should be written
+       region - String with aws region
+       body - Bytes with the serialized json payload to upload
+    '''
     try:
         s3_extra_args = get_s3_kms_extra_args()
-        session = boto3.session.Session()
-        s3_client = session.client('s3', region_name=region, config=get_boto_config())
+        s3_client = _get_s3_client(region)
         s3_client.put_object(Bucket=bucket,
-                             Key=key, Body=bytes(json.dumps(metrics), encoding='utf-8'), **s3_extra_args)
+                             Key=key, Body=body, **s3_extra_args)
     except botocore.exceptions.ClientError as err:
         log_and_exit("Unable to write metrics to s3: bucket: {}, error: {}"
                          .format(bucket, err.response['Error']['Code']),
@@ -62,19 +208,90 @@ def write_metrics_to_s3(bucket, key, region, metrics):
                      SIMAPP_SIMULATION_WORKER_EXCEPTION, 
                      SIMAPP_EVENT_ERROR_CODE_500)
 
-def write_simtrace_to_local_file(file_path: str, metrics_data: OrderedDict):
-    """ Write the metrics data to s3
+# Hot path enum values hoisted to module level so per-step references are a
+# single global load instead of an attribute walk on the enum class
+_SM_EPISODE = StepMetrics.EPISODE.value
+_SM_STEPS = StepMetrics.STEPS.value
+_SM_PROG = StepMetrics.PROG.value
+_SM_REWARD = StepMetrics.REWARD.value
+_SM_X = StepMetrics.X.value
+_SM_Y = StepMetrics.Y.value
+_SM_YAW = StepMetrics.YAW.value
+_SM_STEER = StepMetrics.STEER.value
+_SM_THROTTLE = StepMetrics.THROTTLE.value
+_SM_ACTION = StepMetrics.ACTION.value
+_SM_DONE = StepMetrics.DONE.value
+_SM_WHEELS_TRACK = StepMetrics.WHEELS_TRACK.value
+_SM_CLS_WAYPNT = StepMetrics.CLS_WAYPNT.value
+_SM_TRACK_LEN = StepMetrics.TRACK_LEN.value
+_SM_TIME = StepMetrics.TIME.value
+_SM_EPISODE_STATUS = StepMetrics.EPISODE_STATUS.value
+_ES_CRASHED = EpisodeStatus.CRASHED.value
+_ES_OFF_TRACK = EpisodeStatus.OFF_TRACK.value
+_ES_IMMOBILIZED = EpisodeStatus.IMMOBILIZED.value
+_ES_REVERSED = EpisodeStatus.REVERSED.value
+_MP4_LAP_COUNTER = Mp4VideoMetrics.LAP_COUNTER.value
+_MP4_COMPLETION_PERCENTAGE = Mp4VideoMetrics.COMPLETION_PERCENTAGE.value
+_MP4_RESET_COUNTER = Mp4VideoMetrics.RESET_COUNTER.value
+_MP4_THROTTLE = Mp4VideoMetrics.THROTTLE.value
+_MP4_STEERING = Mp4VideoMetrics.STEERING.value
+_MP4_BEST_LAP_TIME = Mp4VideoMetrics.BEST_LAP_TIME.value
+_MP4_TOTAL_EVALUATION_TIME = Mp4VideoMetrics.TOTAL_EVALUATION_TIME.value
+_MP4_DONE = Mp4VideoMetrics.DONE.value
+
+# Fixed slots for the reset counters so per-step bookkeeping indexes a
+# contiguous array of unsigned ints instead of a string keyed dict
+_IDX_CRASHED = 0
+_IDX_OFF_TRACK = 1
+_IDX_IMMOBILIZED = 2
+_IDX_REVERSED = 3
+_STATUS_TO_IDX = {_ES_CRASHED: _IDX_CRASHED,
+                  _ES_OFF_TRACK: _IDX_OFF_TRACK,
+                  _ES_IMMOBILIZED: _IDX_IMMOBILIZED,
+                  _ES_REVERSED: _IDX_REVERSED}
+
+# Row template matching the StepMetrics column order, with the same precision
+# per column as the SIM_TRACE_LOG cloud watch line
+_SIMTRACE_ROW_FORMAT = '%d,%d,%.4f,%.4f,%.4f,%.2f,%.2f,%d,%.4f,%s,%s,%.4f,%d,%.2f,%s,%s\n'
+_SIMTRACE_CSV_HEADER = ','.join([key.value for key in StepMetrics]) + '\n'
+
+# Persistent simtrace file handles keyed by file path so each step is a single
+# buffered write instead of an open/write/close cycle at sim tick rate
+_SIMTRACE_HANDLES = dict()
+
+def close_simtrace_files():
+    '''Flushes and closes all the open simtrace file handles, must be called
+       before the local simtrace files are uploaded and removed so all rows
+       land on disk and the next write starts a fresh file
+    '''
+    for filepointer in _SIMTRACE_HANDLES.values():
+        filepointer.close()
+    _SIMTRACE_HANDLES.clear()
+
+atexit.register(close_simtrace_files)
+
+def _get_simtrace_handle(file_path):
+    '''Returns the persistent handle for the given simtrace file, opening it
+       and writing the CSV header on first use
+       file_path - Path of the local simtrace file
+    '''
+    filepointer = _SIMTRACE_HANDLES.get(file_path)
+    if filepointer is None:
+        filepointer = open(file_path, 'a', buffering=8192)
+        _SIMTRACE_HANDLES[file_path] = filepointer
+        if filepointer.tell() == 0:
+            filepointer.write(_SIMTRACE_CSV_HEADER)
+    return filepointer
+
+def write_simtrace_to_local_file(file_path: str, metrics_data: dict):
+    """ Write the step metrics to a local file
     Arguments:
-        file_path {str} -- [description]
-        metrics_data {OrderedDict} -- [description]
+        file_path {str} -- path of the local simtrace file
+        metrics_data {dict} -- step metrics to write, keys must be in
+                               StepMetrics order
     """
-    assert isinstance(metrics_data, OrderedDict), 'SimTrace metrics data argument must be of type OrderedDict'
     if metrics_data is not None:
-        if not os.path.exists(file_path):
-            with open(file_path, 'w') as filepointer:
-                filepointer.write(','.join([str(key) for key, value in metrics_data.items()])+"\n")
-        with open(file_path, 'a') as filepointer:
-            filepointer.write(','.join([str(value) for key, value in metrics_data.items()])+"\n")
+        _get_simtrace_handle(file_path).write(_SIMTRACE_ROW_FORMAT % tuple(metrics_data.values()))
 
 class TrainingMetrics(MetricsInterface, ObserverInterface):
     '''This class is responsible for uploading training metrics to s3'''
@@ -89,27 +306,43 @@ class TrainingMetrics(MetricsInterface, ObserverInterface):
            use_model_picker - Flag to whether to use model picker or not.
         '''
         self._agent_name_ = agent_name
-        self._s3_dict_metrics_ = s3_dict_metrics
-        self._s3_dict_model_ = s3_dict_model
+        # Resolve the s3 locations once so the upload paths skip the repeated
+        # enum and dict lookups
+        self._metrics_bucket_ = s3_dict_metrics[MetricsS3Keys.METRICS_BUCKET.value]
+        self._metrics_key_ = s3_dict_metrics[MetricsS3Keys.METRICS_KEY.value]
+        self._metrics_region_ = s3_dict_metrics[MetricsS3Keys.REGION.value]
+        self._model_bucket_ = s3_dict_model[MetricsS3Keys.METRICS_BUCKET.value]
+        self._model_key_ = s3_dict_model[MetricsS3Keys.METRICS_KEY.value]
+        self._model_region_ = s3_dict_model[MetricsS3Keys.REGION.value]
         self._start_time_ = time.time()
         self._episode_ = 0
         self._episode_reward_ = 0.0
         self._progress_ = 0.0
         self._episode_status = ''
         self._metrics_ = list()
+        # Already serialized episode dicts joined by commas, so each upload only
+        # encodes the newly appended episode instead of re-walking the full list
+        self._serialized_metrics_ = bytearray()
         self._is_eval_ = True
         self._eval_trials_ = 0
         self._checkpoint_state_ = CheckpointStateFile(ckpnt_dir)
+        # Cached (name, mtime) of the checkpoint state file so phase
+        # transitions only hit the disk when the file has actually changed
+        self._ckpt_cache_ = (None, 0.0)
         self._use_model_picker = use_model_picker
         self._eval_stats_dict_ = {'chkpnt_name': None, 'avg_comp_pct': 0.0}
         self._best_chkpnt_stats = {'name': None, 'avg_comp_pct': 0.0, 'time_stamp': time.time()}
         self._current_eval_pct_list_ = list()
         self.is_save_simtrace_enabled = rospy.get_param('SIMTRACE_S3_BUCKET', None)
+        # When enabled, upload only the newest episode to a sharded key instead
+        # of rewriting the full metrics object after every episode
+        self._incremental_upload_enabled = rospy.get_param('METRICS_INCREMENTAL_UPLOAD', False)
         run_phase_sink.register(self)
-        # Create the agent specific directories needed for storing the metric files
-        simtrace_dirname = os.path.dirname(IterationDataLocalFileNames.SIM_TRACE_TRAINING_LOCAL_FILE.value)
-        if not os.path.exists(os.path.join(ITERATION_DATA_LOCAL_FILE_PATH, self._agent_name_, simtrace_dirname)):
-            os.makedirs(os.path.join(ITERATION_DATA_LOCAL_FILE_PATH, self._agent_name_, simtrace_dirname))
+        # Resolve the simtrace file path once for the per-step writes and
+        # create the agent specific directories needed for the metric files
+        self._simtrace_file_path_ = os.path.join(ITERATION_DATA_LOCAL_FILE_PATH, self._agent_name_,
+                                                 IterationDataLocalFileNames.SIM_TRACE_TRAINING_LOCAL_FILE.value)
+        os.makedirs(os.path.dirname(self._simtrace_file_path_), exist_ok=True)
 
     def reset(self):
         self._start_time_ = time.time()
@@ -119,53 +352,73 @@ class TrainingMetrics(MetricsInterface, ObserverInterface):
     def append_episode_metrics(self):
         self._episode_ += 1 if not self._is_eval_ else 0
         self._eval_trials_ += 1 if not self._is_eval_ else 0
+        now = time.time()
         training_metric = dict()
         training_metric['reward_score'] = int(round(self._episode_reward_))
-        training_metric['metric_time'] = int(round(time.time() * 1000))
+        training_metric['metric_time'] = int(round(now * 1000))
         training_metric['start_time'] = int(round(self._start_time_ * 1000))
         training_metric['elapsed_time_in_milliseconds'] = \
-            int(round((time.time() - self._start_time_) * 1000))
+            int(round((now - self._start_time_) * 1000))
         training_metric['episode'] = int(self._episode_)
         training_metric['trial'] = int(self._eval_trials_)
         training_metric['phase'] = 'evaluation' if self._is_eval_ else 'training'
         training_metric['completion_percentage'] = int(self._progress_)
         training_metric['episode_status'] = EpisodeStatus.get_episode_status_label(self._episode_status)
         self._metrics_.append(training_metric)
+        if self._serialized_metrics_:
+            self._serialized_metrics_ += b','
+        self._serialized_metrics_ += serialize_metrics(training_metric)
 
     def upload_episode_metrics(self):
-        write_metrics_to_s3(self._s3_dict_metrics_[MetricsS3Keys.METRICS_BUCKET.value],
-                            self._s3_dict_metrics_[MetricsS3Keys.METRICS_KEY.value],
-                            self._s3_dict_metrics_[MetricsS3Keys.REGION.value],
-                            {'metrics': self._metrics_})
+        if self._incremental_upload_enabled:
+            # Nothing to shard when no episode has been appended yet
+            if self._metrics_:
+                write_incremental_metrics_to_s3(self._metrics_bucket_,
+                                                self._metrics_key_,
+                                                self._metrics_region_,
+                                                len(self._metrics_),
+                                                self._metrics_[-1])
+        else:
+            write_metrics_body_to_s3(self._metrics_bucket_,
+                                     self._metrics_key_,
+                                     self._metrics_region_,
+                                     b'{"metrics":[' + self._serialized_metrics_ + b']}')
         if self._is_eval_:
             self._current_eval_pct_list_.append(self._progress_)
 
     def upload_step_metrics(self, metrics):
-        self._progress_ = metrics[StepMetrics.PROG.value]
-        self._episode_status = metrics[StepMetrics.EPISODE_STATUS.value]
-        self._episode_reward_ += metrics[StepMetrics.REWARD.value]
+        self._progress_ = metrics[_SM_PROG]
+        self._episode_status = metrics[_SM_EPISODE_STATUS]
+        self._episode_reward_ += metrics[_SM_REWARD]
         #! TODO have this work with new sim trace class
         if not self._is_eval_:
-            metrics[StepMetrics.EPISODE.value] = self._episode_
-            self._episode_reward_ += metrics[StepMetrics.REWARD.value]
+            metrics[_SM_EPISODE] = self._episode_
+            self._episode_reward_ += metrics[_SM_REWARD]
             StepMetrics.validate_dict(metrics)
-            sim_trace_log(metrics)
-            if self.is_save_simtrace_enabled:
-                write_simtrace_to_local_file(
-                    os.path.join(os.path.join(ITERATION_DATA_LOCAL_FILE_PATH, self._agent_name_),
-                                 IterationDataLocalFileNames.SIM_TRACE_TRAINING_LOCAL_FILE.value),
-                    metrics)
+            _emit_step_metrics(metrics,
+                               self._simtrace_file_path_ if self.is_save_simtrace_enabled else None)
+
+    def _read_ckpt_name(self):
+        '''Returns the name in the checkpoint state file, re-reading the file
+           from disk only when its mtime has changed since the last read
+        '''
+        current_mtime = os.stat(self._checkpoint_state_.path).st_mtime
+        name, cached_mtime = self._ckpt_cache_
+        if name is None or current_mtime != cached_mtime:
+            name = self._checkpoint_state_.read().name
+            self._ckpt_cache_ = (name, current_mtime)
+        return name
 
     def update(self, data):
         self._is_eval_ = data != RunPhase.TRAIN
 
         if not self._is_eval_ and self._use_model_picker:
             if self._eval_stats_dict_['chkpnt_name'] is None:
-                self._eval_stats_dict_['chkpnt_name'] = self._checkpoint_state_.read().name
+                self._eval_stats_dict_['chkpnt_name'] = self._read_ckpt_name()
 
             self._eval_trials_ = 0
-            mean_pct = statistics.mean(self._current_eval_pct_list_ if \
-                                       self._current_eval_pct_list_ else [-1])
+            eval_pct_list = self._current_eval_pct_list_
+            mean_pct = sum(eval_pct_list) / len(eval_pct_list) if eval_pct_list else -1
             LOGGER.info('Number of evaluations: {} Evaluation progresses: {}'.format(len(self._current_eval_pct_list_),
                                                                                      self._current_eval_pct_list_))
             LOGGER.info('Evaluation progresses mean: {}'.format(mean_pct))
@@ -184,16 +437,16 @@ class TrainingMetrics(MetricsInterface, ObserverInterface):
             last_chkpnt_stats = {'name': self._eval_stats_dict_['chkpnt_name'],
                                  'avg_comp_pct': mean_pct,
                                  'time_stamp': time_stamp}
-            write_metrics_to_s3(self._s3_dict_model_[MetricsS3Keys.METRICS_BUCKET.value],
-                                self._s3_dict_model_[MetricsS3Keys.METRICS_KEY.value],
-                                self._s3_dict_model_[MetricsS3Keys.REGION.value],
+            write_metrics_to_s3(self._model_bucket_,
+                                self._model_key_,
+                                self._model_region_,
                                 {BEST_CHECKPOINT: self._best_chkpnt_stats,
                                  LAST_CHECKPOINT: last_chkpnt_stats})
             # Update the checkpoint name to the new checkpoint being used for training that will
             # then be evaluated, note this class gets notfied when the system is put into a
             # training phase and assumes that a training phase only starts when a new check point
             # is avaialble
-            self._eval_stats_dict_['chkpnt_name'] = self._checkpoint_state_.read().name
+            self._eval_stats_dict_['chkpnt_name'] = self._read_ckpt_name()
 
 class EvalMetrics(MetricsInterface):
     '''This class is responsible for uploading eval metrics to s3'''
@@ -207,25 +460,36 @@ class EvalMetrics(MetricsInterface):
             is_continuous (bool): True if continuous race, False otherwise
         '''
         self._agent_name_ = agent_name
-        self._s3_dict_metrics_ = s3_dict_metrics
+        # Resolve the s3 locations once so the upload paths skip the repeated
+        # enum and dict lookups
+        self._metrics_bucket_ = s3_dict_metrics[MetricsS3Keys.METRICS_BUCKET.value]
+        self._metrics_key_ = s3_dict_metrics[MetricsS3Keys.METRICS_KEY.value]
+        self._metrics_region_ = s3_dict_metrics[MetricsS3Keys.REGION.value]
         self._is_continuous = is_continuous
         self._start_time_ = time.time()
         self._number_of_trials_ = 0
         self._progress_ = 0.0
         self._episode_status = ''
         self._metrics_ = list()
+        # Already serialized episode dicts joined by commas, so each upload only
+        # encodes the newly appended episode instead of re-walking the full list
+        self._serialized_metrics_ = bytearray()
         # This is used to calculate the actual distance traveled by the car
-        self._agent_xy = list()
+        self._agent_xy = tuple()
         self._prev_step_time = None
         self.is_save_simtrace_enabled = rospy.get_param('SIMTRACE_S3_BUCKET', None)
-        # Create the agent specific directories needed for storing the metric files
-        simtrace_dirname = os.path.dirname(IterationDataLocalFileNames.SIM_TRACE_EVALUATION_LOCAL_FILE.value)
-        if not os.path.exists(os.path.join(ITERATION_DATA_LOCAL_FILE_PATH, self._agent_name_, simtrace_dirname)):
-            os.makedirs(os.path.join(ITERATION_DATA_LOCAL_FILE_PATH, self._agent_name_, simtrace_dirname))
-        self.reset_count_dict = {EpisodeStatus.CRASHED.value: 0,
-                                 EpisodeStatus.OFF_TRACK.value: 0,
-                                 EpisodeStatus.IMMOBILIZED.value: 0,
-                                 EpisodeStatus.REVERSED.value: 0}
+        # When enabled, upload only the newest episode to a sharded key instead
+        # of rewriting the full metrics object after every episode
+        self._incremental_upload_enabled = rospy.get_param('METRICS_INCREMENTAL_UPLOAD', False)
+        # Resolve the simtrace file path once for the per-step writes and
+        # create the agent specific directories needed for the metric files
+        self._simtrace_file_path_ = os.path.join(ITERATION_DATA_LOCAL_FILE_PATH, self._agent_name_,
+                                                 IterationDataLocalFileNames.SIM_TRACE_EVALUATION_LOCAL_FILE.value)
+        os.makedirs(os.path.dirname(self._simtrace_file_path_), exist_ok=True)
+        self.reset_counts = array.array('L', [0, 0, 0, 0])
+        # Running total of the current lap's resets, only one counter can
+        # change per step so keeping the sum incrementally is O(1)
+        self._reset_count_current = 0
         self._best_lap_time = float('inf')
         self._total_evaluation_time = 0
         self._video_metrics = Mp4VideoMetrics.get_empty_dict()
@@ -235,93 +499,94 @@ class EvalMetrics(MetricsInterface):
 
     def reset(self):
         self._start_time_ = time.time()
-        self._reset_count_sum += \
-            self.reset_count_dict[EpisodeStatus.CRASHED.value] +\
-            self.reset_count_dict[EpisodeStatus.IMMOBILIZED.value] +\
-            self.reset_count_dict[EpisodeStatus.OFF_TRACK.value] +\
-            self.reset_count_dict[EpisodeStatus.REVERSED.value]
-        for key in self.reset_count_dict.keys():
-            self.reset_count_dict[key] = 0
+        self._reset_count_sum += self._reset_count_current
+        self._reset_count_current = 0
+        self.reset_counts = array.array('L', [0, 0, 0, 0])
 
     def append_episode_metrics(self):
         self._number_of_trials_ += 1
+        now = time.time()
         eval_metric = dict()
         eval_metric['completion_percentage'] = int(self._progress_)
-        eval_metric['metric_time'] = int(round(time.time() * 1000))
+        eval_metric['metric_time'] = int(round(now * 1000))
         eval_metric['start_time'] = int(round(self._start_time_ * 1000))
         eval_metric['elapsed_time_in_milliseconds'] = \
-            int(round((time.time() - self._start_time_) * 1000))
+            int(round((now - self._start_time_) * 1000))
         eval_metric['trial'] = int(self._number_of_trials_)
         eval_metric['episode_status'] = EpisodeStatus.get_episode_status_label(self._episode_status)
-        eval_metric['crash_count'] = self.reset_count_dict[EpisodeStatus.CRASHED.value]
-        eval_metric['immobilized_count'] = self.reset_count_dict[EpisodeStatus.IMMOBILIZED.value]
-        eval_metric['off_track_count'] = self.reset_count_dict[EpisodeStatus.OFF_TRACK.value]
-        eval_metric['reversed_count'] = self.reset_count_dict[EpisodeStatus.REVERSED.value]
-        eval_metric['reset_count'] = eval_metric['crash_count'] + \
-                                     eval_metric['immobilized_count'] + \
-                                     eval_metric['off_track_count'] + \
-                                     eval_metric['reversed_count']
+        eval_metric['crash_count'] = self.reset_counts[_IDX_CRASHED]
+        eval_metric['immobilized_count'] = self.reset_counts[_IDX_IMMOBILIZED]
+        eval_metric['off_track_count'] = self.reset_counts[_IDX_OFF_TRACK]
+        eval_metric['reversed_count'] = self.reset_counts[_IDX_REVERSED]
+        eval_metric['reset_count'] = self._reset_count_current
         self._best_lap_time = min(eval_metric['elapsed_time_in_milliseconds'], self._best_lap_time)
         self._total_evaluation_time += eval_metric['elapsed_time_in_milliseconds']
         self._metrics_.append(eval_metric)
+        if self._serialized_metrics_:
+            self._serialized_metrics_ += b','
+        self._serialized_metrics_ += serialize_metrics(eval_metric)
 
     def upload_episode_metrics(self):
-        write_metrics_to_s3(self._s3_dict_metrics_[MetricsS3Keys.METRICS_BUCKET.value],
-                            self._s3_dict_metrics_[MetricsS3Keys.METRICS_KEY.value],
-                            self._s3_dict_metrics_[MetricsS3Keys.REGION.value],
-                            {'metrics': self._metrics_})
+        if self._incremental_upload_enabled:
+            # Continuous races call this without an appended episode, nothing
+            # to shard in that case
+            if self._metrics_:
+                write_incremental_metrics_to_s3(self._metrics_bucket_,
+                                                self._metrics_key_,
+                                                self._metrics_region_,
+                                                len(self._metrics_),
+                                                self._metrics_[-1])
+        else:
+            write_metrics_body_to_s3(self._metrics_bucket_,
+                                     self._metrics_key_,
+                                     self._metrics_region_,
+                                     b'{"metrics":[' + self._serialized_metrics_ + b']}')
 
     def _update_mp4_video_metrics(self, metrics):
         actual_speed = 0
         cur_time = time.time()
-        agent_x, agent_y = metrics[StepMetrics.X.value], metrics[StepMetrics.Y.value]
+        agent_x, agent_y = metrics[_SM_X], metrics[_SM_Y]
         if self._agent_xy:
             # Speed = Distance/Time
             delta_time = cur_time - self._prev_step_time
-            actual_speed = math.sqrt((self._agent_xy[0] - agent_x) ** 2 +
-                                     (self._agent_xy[1] - agent_y) ** 2) / delta_time
-        self._agent_xy = [agent_x, agent_y]
+            actual_speed = math.hypot(self._agent_xy[0] - agent_x,
+                                      self._agent_xy[1] - agent_y) / delta_time
+        self._agent_xy = (agent_x, agent_y)
         self._prev_step_time = cur_time
 
-        self._video_metrics[Mp4VideoMetrics.LAP_COUNTER.value] = self._number_of_trials_
-        self._video_metrics[Mp4VideoMetrics.COMPLETION_PERCENTAGE.value] = self._progress_
+        self._video_metrics[_MP4_LAP_COUNTER] = self._number_of_trials_
+        self._video_metrics[_MP4_COMPLETION_PERCENTAGE] = self._progress_
         # For continuous race, MP4 video will display the total reset counter for the entire race
         # For non-continuous race, MP4 video will display reset counter per lap
-        self._video_metrics[Mp4VideoMetrics.RESET_COUNTER.value] = \
-            self.reset_count_dict[EpisodeStatus.CRASHED.value] + \
-            self.reset_count_dict[EpisodeStatus.IMMOBILIZED.value] + \
-            self.reset_count_dict[EpisodeStatus.OFF_TRACK.value] + \
-            self.reset_count_dict[EpisodeStatus.REVERSED.value] + \
+        self._video_metrics[_MP4_RESET_COUNTER] = self._reset_count_current + \
             (self._reset_count_sum if self._is_continuous else 0)
 
-        self._video_metrics[Mp4VideoMetrics.THROTTLE.value] = actual_speed
-        self._video_metrics[Mp4VideoMetrics.STEERING.value] = metrics[StepMetrics.STEER.value]
-        self._video_metrics[Mp4VideoMetrics.BEST_LAP_TIME.value] = self._best_lap_time
-        self._video_metrics[Mp4VideoMetrics.TOTAL_EVALUATION_TIME.value] = self._total_evaluation_time +\
-                                int(round((time.time() - self._start_time_) * 1000))
-        self._video_metrics[Mp4VideoMetrics.DONE.value] = metrics[StepMetrics.DONE.value]
+        self._video_metrics[_MP4_THROTTLE] = actual_speed
+        self._video_metrics[_MP4_STEERING] = metrics[_SM_STEER]
+        self._video_metrics[_MP4_BEST_LAP_TIME] = self._best_lap_time
+        self._video_metrics[_MP4_TOTAL_EVALUATION_TIME] = self._total_evaluation_time +\
+                                int(round((cur_time - self._start_time_) * 1000))
+        self._video_metrics[_MP4_DONE] = metrics[_SM_DONE]
 
     def upload_step_metrics(self, metrics):
-        metrics[StepMetrics.EPISODE.value] = self._number_of_trials_
-        self._progress_ = metrics[StepMetrics.PROG.value]
-        self._episode_status = metrics[StepMetrics.EPISODE_STATUS.value]
-        if self._episode_status in self.reset_count_dict:
-            self.reset_count_dict[self._episode_status] += 1
+        metrics[_SM_EPISODE] = self._number_of_trials_
+        self._progress_ = metrics[_SM_PROG]
+        self._episode_status = metrics[_SM_EPISODE_STATUS]
+        reset_idx = _STATUS_TO_IDX.get(self._episode_status)
+        if reset_idx is not None:
+            self.reset_counts[reset_idx] += 1
+            self._reset_count_current += 1
         StepMetrics.validate_dict(metrics)
-        sim_trace_log(metrics)
-        if self.is_save_simtrace_enabled:
-            write_simtrace_to_local_file(
-                os.path.join(os.path.join(ITERATION_DATA_LOCAL_FILE_PATH, self._agent_name_),
-                             IterationDataLocalFileNames.SIM_TRACE_EVALUATION_LOCAL_FILE.value),
-                metrics)
+        _emit_step_metrics(metrics,
+                           self._simtrace_file_path_ if self.is_save_simtrace_enabled else None)
         self._update_mp4_video_metrics(metrics)
 
     def _handle_get_video_metrics(self, req):
-        return VideoMetricsSrvResponse(self._video_metrics[Mp4VideoMetrics.LAP_COUNTER.value],
-                                       self._video_metrics[Mp4VideoMetrics.COMPLETION_PERCENTAGE.value],
-                                       self._video_metrics[Mp4VideoMetrics.RESET_COUNTER.value],
-                                       self._video_metrics[Mp4VideoMetrics.THROTTLE.value],
-                                       self._video_metrics[Mp4VideoMetrics.STEERING.value],
-                                       self._video_metrics[Mp4VideoMetrics.BEST_LAP_TIME.value],
-                                       self._video_metrics[Mp4VideoMetrics.TOTAL_EVALUATION_TIME.value],
-                                       self._video_metrics[Mp4VideoMetrics.DONE.value])
+        return VideoMetricsSrvResponse(self._video_metrics[_MP4_LAP_COUNTER],
+                                       self._video_metrics[_MP4_COMPLETION_PERCENTAGE],
+                                       self._video_metrics[_MP4_RESET_COUNTER],
+                                       self._video_metrics[_MP4_THROTTLE],
+                                       self._video_metrics[_MP4_STEERING],
+                                       self._video_metrics[_MP4_BEST_LAP_TIME],
+                                       self._video_metrics[_MP4_TOTAL_EVALUATION_TIME],
+                                       self._video_metrics[_MP4_DONE])
@@ -34,7 +34,7 @@ from markov.agents.rollout_agent_factory import create_rollout_agent, create_obs
 from markov.agents.utils import RunPhaseSubject
 from markov.log_handler.deepracer_exceptions import GenericRolloutError, GenericRolloutException
 from markov.environments.constants import VELOCITY_TOPICS, STEERING_TOPICS, LINK_NAMES
-from markov.metrics.s3_metrics import TrainingMetrics
+from markov.metrics.s3_metrics import TrainingMetrics, close_simtrace_files, drain_metrics_uploads
 from markov.rollout_utils import (PhaseObserver, signal_robomaker_markov_package_ready,
                                   configure_environment_randomizer)
 from markov.metrics.s3_writer import S3Writer
@@ -114,6 +114,8 @@ def exit_if_trainer_done(checkpoint_dir, s3_writer, rollout_idx):
         if is_save_mp4_enabled:
             unsubscribe_from_save_mp4 = ServiceProxyWrapper('/racecar/save_mp4/unsubscribe_from_save_mp4', Empty)
             unsubscribe_from_save_mp4(EmptyRequest())
+        close_simtrace_files()
+        drain_metrics_uploads()
         s3_writer.upload_to_s3()
         logger.info("Received termination signal from trainer. Goodbye.")
         simapp_exit_gracefully()
@@ -184,6 +186,8 @@ def rollout_worker(graph_manager, num_workers, rollout_idx, task_parameters, s3_
                 new_checkpoint = data_store.get_chkpoint_num('agent')
             if is_save_mp4_enabled:
                 unsubscribe_from_save_mp4(EmptyRequest())
+            close_simtrace_files()
+            drain_metrics_uploads()
             s3_writer.upload_to_s3()
 
             pause_physics(EmptyRequest())
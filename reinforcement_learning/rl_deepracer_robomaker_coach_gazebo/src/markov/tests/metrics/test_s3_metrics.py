@@ -0,0 +1,56 @@
+import pytest
+
+# If it fails to import this package it will skip the complete module
+# Use this import if its a robomaker unit test
+rospy = pytest.importorskip("rospy")
+
+from markov.metrics import s3_metrics
+from markov.metrics.s3_metrics import _emit_step_metrics, write_simtrace_to_local_file
+from markov.metrics.constants import StepMetrics, EpisodeStatus
+
+@pytest.fixture
+def step_metrics():
+    ''' Step metrics dict shaped like the one built in agent control, note the
+        steps counter is a float there
+    '''
+    metrics = StepMetrics.make_default_metric()
+    metrics[StepMetrics.EPISODE.value] = 0
+    metrics[StepMetrics.STEPS.value] = 2.0
+    metrics[StepMetrics.X.value] = 1.2345
+    metrics[StepMetrics.Y.value] = -0.5
+    metrics[StepMetrics.YAW.value] = 12.5
+    metrics[StepMetrics.STEER.value] = -15.0
+    metrics[StepMetrics.THROTTLE.value] = 0.5
+    metrics[StepMetrics.ACTION.value] = 3
+    metrics[StepMetrics.REWARD.value] = 1.0
+    metrics[StepMetrics.DONE.value] = False
+    metrics[StepMetrics.WHEELS_TRACK.value] = True
+    metrics[StepMetrics.PROG.value] = 10.5
+    metrics[StepMetrics.CLS_WAYPNT.value] = 7
+    metrics[StepMetrics.TRACK_LEN.value] = 17.6
+    metrics[StepMetrics.TIME.value] = 1596000000.123
+    metrics[StepMetrics.EPISODE_STATUS.value] = EpisodeStatus.IN_PROGRESS.value
+    return metrics
+
+@pytest.mark.robomaker
+def test_emit_step_metrics_float_steps(step_metrics, tmpdir):
+    ''' The row formatting must truncate the float steps column like the
+        original % template instead of raising
+    '''
+    file_path = str(tmpdir.join('iteration.csv'))
+    _emit_step_metrics(step_metrics, file_path)
+    s3_metrics.close_simtrace_files()
+    with open(file_path) as filepointer:
+        header, row = filepointer.read().splitlines()
+    assert header.split(',') == [key.value for key in StepMetrics]
+    assert row.split(',')[1] == '2'
+
+@pytest.mark.robomaker
+def test_write_simtrace_to_local_file_float_steps(step_metrics, tmpdir):
+    ''' Testing write_simtrace_to_local_file with the real dict shape '''
+    file_path = str(tmpdir.join('iteration.csv'))
+    write_simtrace_to_local_file(file_path, step_metrics)
+    s3_metrics.close_simtrace_files()
+    with open(file_path) as filepointer:
+        lines = filepointer.read().splitlines()
+    assert lines[-1].split(',')[1] == '2'
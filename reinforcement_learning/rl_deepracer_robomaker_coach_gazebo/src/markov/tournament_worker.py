@@ -23,7 +23,7 @@ from markov.agents.utils import RunPhaseSubject
 from markov.defaults import reward_function
 from markov.log_handler.deepracer_exceptions import GenericRolloutError, GenericRolloutException
 from markov.environments.constants import VELOCITY_TOPICS, STEERING_TOPICS, LINK_NAMES
-from markov.metrics.s3_metrics import EvalMetrics
+from markov.metrics.s3_metrics import EvalMetrics, close_simtrace_files, drain_metrics_uploads
 from markov.metrics.s3_writer import S3Writer
 from markov.metrics.iteration_data import IterationData
 from markov.metrics.constants import MetricsS3Keys, IterationDataLocalFileNames, ITERATION_DATA_LOCAL_FILE_PATH
@@ -110,6 +110,8 @@ def tournament_worker(graph_manager, number_of_trials, task_parameters, s3_write
     if is_save_mp4_enabled:
         for unsubscribe_mp4 in unsubscribe_from_save_mp4:
             unsubscribe_mp4(EmptyRequest())
+    close_simtrace_files()
+    drain_metrics_uploads()
     for s3_writer in s3_writers:
         s3_writer.upload_to_s3()
     time.sleep(1)